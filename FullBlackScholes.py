@@ -1,28 +1,43 @@
-import yfinance as yf
-from scipy.stats import norm
+from scipy.special import ndtr
 import numpy as np
-from datetime import datetime
-import matplotlib.pyplot as plt
-import requests
-import pandas as pd
-import xlsxwriter
+from datetime import datetime, date
 import logging
-from arch import arch_model
+import math
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+
+_SQRT_2PI_INV = 0.3989422804014327  # 1 / sqrt(2 * pi)
+_SQRT2 = math.sqrt(2)
+
+# yfinance, arch, matplotlib, xlsxwriter and requests are imported where they
+# are used so that pricing-only callers do not pay their import cost.
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, filename='option_pricing.log', filemode='w', format='%(asctime)s - %(levelname)s - %(message)s')
 
-def fetch_historical_data(ticker_symbol, period='1y'):
+@lru_cache(maxsize=8)
+def _fetch_history(ticker_symbol, period, day):
+    # `day` only keys the cache, so a long-running process refetches daily
+    import yfinance as yf
     ticker = yf.Ticker(ticker_symbol)
     return ticker.history(period=period)
 
+def fetch_historical_data(ticker_symbol, period='1y'):
+    # Copy so callers cannot mutate the cached DataFrame
+    return _fetch_history(ticker_symbol, period, date.today()).copy()
+
 def get_garch_volatility(returns):
     """Estimate volatility using GARCH(1,1) model with scaled returns."""
+    from arch import arch_model
     scale = 100  # Scaling factor to improve optimizer performance
     scaled_returns = returns * scale
     model = arch_model(scaled_returns, mean='Zero', vol='Garch', p=1, q=1)
     try:
-        model_fit = model.fit(disp='off')
+        # Warm start at alpha + beta = 0.95 with omega matching the sample variance
+        alpha, beta = 0.05, 0.9
+        var0 = scaled_returns.var()
+        starting_values = np.array([var0 * (1 - alpha - beta), alpha, beta])
+        model_fit = model.fit(disp='off', starting_values=starting_values, options={'maxiter': 100})
         forecast = model_fit.forecast(horizon=1)
         forecasted_variance = forecast.variance.values[-1, -1]
         annualized_volatility = np.sqrt(forecasted_variance) / scale * np.sqrt(252)  # Annualize the volatility
@@ -32,13 +47,27 @@ def get_garch_volatility(returns):
         logging.error("Failed to fit GARCH model: " + str(e))
         return None
 
-def calculate_annualized_volatility(hist_data):
-    daily_returns = hist_data['Close'].pct_change().dropna()
-    if daily_returns.empty or daily_returns.isnull().all():
+def ewma_volatility(returns, lam=0.94):
+    """Annualized RiskMetrics EWMA volatility; closed form, no model fitting."""
+    w = lam ** np.arange(len(returns) - 1, -1, -1)
+    w /= w.sum()
+    return np.sqrt(np.sum(w * returns**2) * 252)
+
+def calculate_annualized_volatility(hist_data, use_garch=False):
+    closes = hist_data['Close'].to_numpy()
+    daily_returns = closes[1:] / closes[:-1] - 1.0
+    daily_returns = daily_returns[~np.isnan(daily_returns)]  # yfinance can return NaN closes
+    if daily_returns.size == 0:
         logging.warning("Daily returns are empty or NaN.")
         return np.nan
 
-    if len(daily_returns) > 30:  # Ensure there's enough data to fit a model
+    if not use_garch:
+        ewma_vol = ewma_volatility(daily_returns)
+        if not np.isnan(ewma_vol):
+            logging.info(f"EWMA Estimated Annualized Volatility: {ewma_vol:.2%}")
+            return ewma_vol
+        logging.warning("EWMA volatility is NaN, falling back to standard deviation.")
+    elif len(daily_returns) > 30:  # Ensure there's enough data to fit a model
         garch_volatility = get_garch_volatility(daily_returns)
         if garch_volatility is not None:
             return garch_volatility
@@ -49,10 +78,21 @@ def calculate_annualized_volatility(hist_data):
     logging.info(f"Standard Deviation Based Annualized Volatility: {fallback_volatility}%")
     return fallback_volatility
 
+@lru_cache(maxsize=16)
+def _option_chain(ticker, expiration_date):
+    return ticker.option_chain(expiration_date)
+
 def fetch_options_data(ticker, expiration_date=None):
     if expiration_date is None:
         expiration_date = ticker.options[0]
-    return ticker.option_chain(expiration_date)
+    return _option_chain(ticker, expiration_date)
+
+def fetch_all_option_chains(ticker, expirations=None):
+    """Fetch option chains for several expirations concurrently, in input order."""
+    if expirations is None:
+        expirations = ticker.options
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        return list(executor.map(lambda exp: _option_chain(ticker, exp), expirations))
 
 def get_current_stock_price(ticker):
     stock_data = ticker.history(period="1d")['Close']
@@ -60,15 +100,16 @@ def get_current_stock_price(ticker):
         return np.nan
     return stock_data.iloc[-1]
 
-def get_implied_volatility(ticker, ticker_symbol, target_date=None):
-    if target_date is None:
-        target_date = ticker.options[0]
-    options_data = ticker.option_chain(target_date)
-    atm_calls = options_data.calls[options_data.calls['strike'] == round(ticker.info['previousClose'])]
-    atm_puts = options_data.puts[options_data.puts['strike'] == round(ticker.info['previousClose'])]
+def get_implied_volatility(ticker, ticker_symbol, target_date=None, hist_data=None):
+    options_data = fetch_options_data(ticker, target_date)
+    prev_close = round(ticker.fast_info['previousClose'])  # fast_info avoids the full .info scrape
+    atm_calls = options_data.calls[options_data.calls['strike'] == prev_close]
+    atm_puts = options_data.puts[options_data.puts['strike'] == prev_close]
     if atm_calls.empty or atm_puts.empty or np.isnan(atm_calls['impliedVolatility'].mean()):
         logging.warning("Implied volatility unavailable, defaulting to historical volatility.")
-        return calculate_annualized_volatility(fetch_historical_data(ticker_symbol))
+        if hist_data is None:
+            hist_data = fetch_historical_data(ticker_symbol)
+        return calculate_annualized_volatility(hist_data)
     iv = (atm_calls['impliedVolatility'].mean() + atm_puts['impliedVolatility'].mean()) / 2
     logging.info(f"Implied Volatility: {iv * 100}%")
     return iv
@@ -79,33 +120,135 @@ def safe_divide(num, denom):
         return 0
     return num / denom
 
+def _Phi(x):
+    """Scalar standard normal CDF; math.erf skips scipy's ufunc dispatch."""
+    return 0.5 * (1.0 + math.erf(x / _SQRT2))
+
 def black_scholes(S, K, T, r, sigma, option_type='call'):
-    if np.isnan(S) or np.isnan(K) or np.isnan(T) or np.isnan(r) or np.isnan(sigma) or sigma == 0:
-        return 0  # Return 0 for option price if any input is not valid or sigma is zero
-    d1 = safe_divide(np.log(S / K) + (r + 0.5 * sigma**2) * T, sigma * np.sqrt(T))
-    d2 = d1 - sigma * np.sqrt(T)
+    if np.isnan(S) or np.isnan(K) or np.isnan(T) or np.isnan(r) or np.isnan(sigma) or sigma == 0 or T <= 0 or S <= 0 or K <= 0:
+        return 0  # Return 0 for option price if any input is not valid, sigma is zero or the option has expired
+    sigma_sqrtT = sigma * math.sqrt(T)
+    disc = math.exp(-r * T)
+    logSK = math.log(S / K)
+    d1 = safe_divide(logSK + (r + 0.5 * sigma * sigma) * T, sigma_sqrtT)
+    d2 = d1 - sigma_sqrtT
     if option_type == 'call':
-        return S * norm.cdf(d1) - K * np.exp(-r * T) * norm.cdf(d2)
+        return S * _Phi(d1) - K * disc * _Phi(d2)
     else:
-        return K * np.exp(-r * T) * norm.cdf(-d2) - S * norm.cdf(-d1)
+        return K * disc * _Phi(-d2) - S * _Phi(-d1)
+
+def make_bs(S, T, r, sigma):
+    """Return a scalar pricer K -> (call, put) specialized to fixed S, T, r and sigma.
+
+    Everything independent of the strike is computed once here, and put-call
+    symmetry N(-x) = 1 - N(x) leaves two erf calls per strike. Invalid inputs
+    give a pricer returning (0, 0), matching black_scholes.
+    """
+    if np.isnan(S) or np.isnan(T) or np.isnan(r) or np.isnan(sigma) or sigma == 0 or T <= 0 or S <= 0:
+        return lambda K: (0, 0)
+    sigma_sqrtT = sigma * math.sqrt(T)
+    disc = math.exp(-r * T)
+    logS_drift = math.log(S) + (r + 0.5 * sigma * sigma) * T
+
+    def bs(K):
+        d1 = (logS_drift - math.log(K)) / sigma_sqrtT
+        d2 = d1 - sigma_sqrtT
+        Nd1 = _Phi(d1)
+        Nd2 = _Phi(d2)
+        return S * Nd1 - K * disc * Nd2, K * disc * (1.0 - Nd2) - S * (1.0 - Nd1)
+    return bs
+
+def _d1_d2(S, Ks, T, r, sigma, sigma_sqrtT):
+    """d1 and d2 for every strike, given the strike-invariant sigma * sqrt(T)."""
+    # safe_divide returns a scalar 0 when sigma * sqrt(T) == 0; keep one d1 per strike
+    d1 = np.broadcast_to(safe_divide(np.log(S / Ks) + (r + 0.5 * sigma * sigma) * T, sigma_sqrtT), Ks.shape)
+    return d1, d1 - sigma_sqrtT
+
+def black_scholes_vec(S, Ks, T, r, sigma):
+    """Price calls and puts for an array of strikes in one pass."""
+    Ks = np.asarray(Ks, dtype=float)
+    if np.isnan(S) or np.isnan(T) or np.isnan(r) or np.isnan(sigma) or sigma == 0 or T <= 0:
+        return np.zeros_like(Ks), np.zeros_like(Ks)
+    sqrtT = math.sqrt(T)
+    sigma_sqrtT = sigma * sqrtT
+    disc = math.exp(-r * T)
+    d1, d2 = _d1_d2(S, Ks, T, r, sigma, sigma_sqrtT)
+    call = S * ndtr(d1) - Ks * disc * ndtr(d2)
+    # ndtr(-d) rather than 1 - ndtr(d): the subtraction cancels away cheap OTM put prices
+    put = Ks * disc * ndtr(-d2) - S * ndtr(-d1)
+    return call, put
 
 def calculate_greeks(S, Ks, T, r, sigma, option_type='call'):
-    results = {'Delta': [], 'Gamma': [], 'Theta': [], 'Vega': [], 'Rho': []}
-    for K in Ks:
-        if np.isnan(S) or np.isnan(sigma) or np.isnan(T) or np.isnan(r):
-            for key in results:
-                results[key].append(np.nan)
-            continue
-        d1 = safe_divide(np.log(S / K) + (r + 0.5 * sigma**2) * T, sigma * np.sqrt(T))
-        d2 = d1 - sigma * np.sqrt(T)
-        results['Delta'].append(norm.cdf(d1) if option_type == 'call' else norm.cdf(d1) - 1)
-        results['Gamma'].append(safe_divide(norm.pdf(d1), S * sigma * np.sqrt(T)))
-        results['Theta'].append(-safe_divide(S * norm.pdf(d1) * sigma, 2 * np.sqrt(T)) - r * K * np.exp(-r * T) * norm.cdf(d2))
-        results['Vega'].append(safe_divide(S * norm.pdf(d1) * np.sqrt(T), 100))
-        results['Rho'].append(safe_divide(K * T * np.exp(-r * T) * (norm.cdf(d2) if option_type == 'call' else -norm.cdf(-d2)), 100))
-    return results
+    Ks = np.asarray(Ks, dtype=float)
+    if np.isnan(S) or np.isnan(sigma) or np.isnan(T) or np.isnan(r) or T <= 0:
+        return {key: np.full(Ks.shape, np.nan) for key in ('Delta', 'Gamma', 'Theta', 'Vega', 'Rho')}
+    is_call = option_type == 'call'
+    sqrtT = math.sqrt(T)
+    sigma_sqrtT = sigma * sqrtT
+    disc = math.exp(-r * T)
+    d1, d2 = _d1_d2(S, Ks, T, r, sigma, sigma_sqrtT)
+    Nd1 = ndtr(d1)
+    Nd2 = ndtr(d2)
+    pdf = _SQRT_2PI_INV * np.exp(-0.5 * d1 * d1)
+    gamma_denom = S * sigma_sqrtT
+    return {
+        'Delta': np.where(is_call, Nd1, Nd1 - 1),
+        'Gamma': pdf / gamma_denom if gamma_denom != 0 else np.zeros_like(pdf),
+        'Theta': -safe_divide(S * pdf * sigma, 2 * sqrtT) - r * Ks * disc * Nd2,
+        'Vega': S * pdf * sqrtT / 100,
+        'Rho': Ks * T * disc * np.where(is_call, Nd2, Nd2 - 1) / 100,
+    }
+
+def implied_vol_slice(S, Ks, T, r, prices, is_call, sigma_lo=1e-6, sigma_hi=5.0, tol=1e-8, max_iter=100):
+    """Solve implied volatility for a whole strike slice with bracketed Newton steps.
+
+    Each iteration prices every strike and its vega from one shared d1. A Newton
+    step that leaves the [lo, hi] bracket, or one taken with a vanishing vega,
+    is replaced by bisection. A strike is converged once |price error| / vega,
+    its first-order error in sigma, is at most tol. Strikes that do not get
+    there within max_iter, and prices outside the no-arbitrage bounds, give NaN.
+    """
+    Ks = np.ascontiguousarray(Ks, dtype=np.float64)
+    prices = np.broadcast_to(np.asarray(prices, dtype=np.float64), Ks.shape)
+    is_call = np.broadcast_to(np.asarray(is_call, dtype=bool), Ks.shape)
+    if T <= 0:
+        return np.full(Ks.shape, np.nan)
+    sqrtT = math.sqrt(T)
+    disc = math.exp(-r * T)
+    logSK = np.log(S / Ks)
+
+    intrinsic = np.where(is_call, np.maximum(S - Ks * disc, 0.0), np.maximum(Ks * disc - S, 0.0))
+    upper = np.where(is_call, S, Ks * disc)
+    valid = (prices > intrinsic) & (prices < upper)
+
+    lo = np.full(Ks.shape, sigma_lo)
+    hi = np.full(Ks.shape, sigma_hi)
+    sigma = np.clip(math.sqrt(2 * math.pi / T) * prices / S, sigma_lo, sigma_hi)  # Brenner-Subrahmanyam guess
+    converged = ~valid
+    for _ in range(max_iter):
+        sigma_sqrtT = sigma * sqrtT
+        d1 = (logSK + (r + 0.5 * sigma * sigma) * T) / sigma_sqrtT
+        d2 = d1 - sigma_sqrtT
+        # Price puts directly: parity through the call cancels away cheap OTM put prices
+        call = S * ndtr(d1) - Ks * disc * ndtr(d2)
+        put = Ks * disc * ndtr(-d2) - S * ndtr(-d1)
+        model = np.where(is_call, call, put)
+        vega = S * _SQRT_2PI_INV * np.exp(-0.5 * d1 * d1) * sqrtT
+        diff = model - prices
+        converged |= np.abs(diff) <= tol * vega
+        if converged.all():
+            break
+        active = ~converged
+        hi = np.where(active & (diff > 0), sigma, hi)
+        lo = np.where(active & (diff < 0), sigma, lo)
+        with np.errstate(divide='ignore', over='ignore', invalid='ignore'):
+            newton = sigma - diff / vega
+        use_newton = (vega > 0) & (newton > lo) & (newton < hi)
+        sigma = np.where(active, np.where(use_newton, newton, 0.5 * (lo + hi)), sigma)
+    return np.where(valid & converged, sigma, np.nan)
 
 def plot_option_prices(strikes, call_prices, put_prices):
+    import matplotlib.pyplot as plt
     plt.figure(figsize=(10, 5))
     plt.plot(strikes, call_prices, marker='o', label='Call Prices')
     plt.plot(strikes, put_prices, marker='x', label='Put Prices')
@@ -117,23 +260,25 @@ def plot_option_prices(strikes, call_prices, put_prices):
     plt.show()
 
 def generate_report(strikes, call_prices, put_prices, Greeks, filename="enhanced_option_report.xlsx"):
-    workbook = xlsxwriter.Workbook(filename, {'nan_inf_to_errors': True})
+    import xlsxwriter
+    workbook = xlsxwriter.Workbook(filename, {'constant_memory': True, 'nan_inf_to_errors': True})
     worksheet = workbook.add_worksheet("Options Data")
     bold = workbook.add_format({'bold': True})
     money_format = workbook.add_format({'num_format': '$#,##0.00'})
     percent_format = workbook.add_format({'num_format': '0.00%'})
 
     headers = ['Strike Price', 'Call Prices', 'Put Prices'] + list(Greeks.keys())
-    for i, header in enumerate(headers):
-        worksheet.write(0, i, header, bold)
+    worksheet.write_row(0, 0, headers, bold)
 
-    for i, strike in enumerate(strikes):
-        worksheet.write(i + 1, 0, strike, money_format)
-        worksheet.write(i + 1, 1, call_prices[i] if not np.isnan(call_prices[i]) else 0, money_format)
-        worksheet.write(i + 1, 2, put_prices[i] if not np.isnan(put_prices[i]) else 0, money_format)
-        for j, key in enumerate(Greeks.keys()):
-            value = Greeks[key][i] if not np.isnan(Greeks[key][i]) else 0
-            worksheet.write(i + 1, j + 3, value, percent_format)
+    # constant_memory streams rows to disk, so rows must be written in order.
+    # Only NaN prices and Greeks become 0; strikes are written raw, and inf is
+    # kept, so nan_inf_to_errors writes those as error cells.
+    strike_values = np.asarray(strikes, dtype=float).tolist()
+    price_rows = np.nan_to_num(np.column_stack([call_prices, put_prices]), nan=0.0, posinf=np.inf, neginf=-np.inf).tolist()
+    greek_rows = np.nan_to_num(np.column_stack(list(Greeks.values())), nan=0.0, posinf=np.inf, neginf=-np.inf).tolist()
+    for i, (strike, price_row, greek_row) in enumerate(zip(strike_values, price_rows, greek_rows)):
+        worksheet.write_row(i + 1, 0, [strike] + price_row, money_format)
+        worksheet.write_row(i + 1, 3, greek_row, percent_format)
 
     chart = workbook.add_chart({'type': 'line'})
     chart.add_series({
@@ -154,26 +299,43 @@ def generate_report(strikes, call_prices, put_prices, Greeks, filename="enhanced
     workbook.close()
     print(f"Report generated and saved as {filename}")
 
-def fetch_risk_free_rate(api_key):
+_SESSION = None
+
+def _http_session():
+    """Shared keep-alive session, created on first use."""
+    global _SESSION
+    if _SESSION is None:
+        import requests
+        _SESSION = requests.Session()
+    return _SESSION
+
+@lru_cache(maxsize=4)
+def _fetch_dtb3(api_key, day):
+    # `day` only keys the cache: FRED publishes DTB3 once per business day
     url = f"https://api.stlouisfed.org/fred/series/observations?series_id=DTB3&api_key={api_key}&file_type=json"
+    response = _http_session().get(url, timeout=5)
+    response.raise_for_status()
+    data = response.json()
+    latest_rate = float(data['observations'][-1]['value'])
+    return latest_rate / 100
+
+def fetch_risk_free_rate(api_key):
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
-        latest_rate = float(data['observations'][-1]['value'])
-        return latest_rate / 100
+        return _fetch_dtb3(api_key, date.today())
     except Exception as e:
         print(f"Error fetching the rate from FRED: {e}")
         return 0.02  # Fallback to a default rate in case of error
 
 def main():
+    import yfinance as yf
     api_key = 'Enter your FRED API Key' # Enter your FRED API Key
     ticker_symbol = "NVDA"
     ticker = yf.Ticker(ticker_symbol)
 
     current_price = get_current_stock_price(ticker)
-    implied_volatility = get_implied_volatility(ticker, ticker_symbol)
-    annualized_volatility = calculate_annualized_volatility(fetch_historical_data(ticker_symbol))
+    hist_data = fetch_historical_data(ticker_symbol)
+    implied_volatility = get_implied_volatility(ticker, ticker_symbol, hist_data=hist_data)
+    annualized_volatility = calculate_annualized_volatility(hist_data)
 
     print(f"Annualized Volatility: {annualized_volatility:.2%}")
     print(f"Current Stock Price: ${current_price:.2f}")
@@ -184,11 +346,10 @@ def main():
 
     T = (datetime(2024, 4, 26) - datetime.now()).days / 365.25
     r = risk_free_rate
-    sigma = implied_volatility if not np.isnan(implied_volatility) else annualized_volatility  # Use GARCH or fallback if NaN
+    sigma = implied_volatility if not np.isnan(implied_volatility) else annualized_volatility  # Use historical estimate if NaN
 
     strikes = np.linspace(current_price * 0.8, current_price * 1.2, 5)
-    call_prices = [black_scholes(current_price, k, T, r, sigma, 'call') for k in strikes]
-    put_prices = [black_scholes(current_price, k, T, r, sigma, 'put') for k in strikes]
+    call_prices, put_prices = black_scholes_vec(current_price, strikes, T, r, sigma)
     Greeks = calculate_greeks(current_price, strikes, T, r, sigma, 'call')
 
     print(f"Black-Scholes Call Option Prices: {call_prices}")
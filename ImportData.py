@@ -13,14 +13,16 @@ ticker = yf.Ticker(ticker_symbol)
 hist = ticker.history(period="1y")
 
 # Calculate daily returns
-daily_returns = hist['Close'].pct_change()
+closes = hist['Close'].to_numpy()
+daily_returns = closes[1:] / closes[:-1] - 1.0
+daily_returns = daily_returns[~np.isnan(daily_returns)]  # Skip gaps from NaN closes
 
 # Calculate annualized volatility (standard deviation of daily returns)
-annualized_volatility = np.std(daily_returns) * np.sqrt(252)
+annualized_volatility = np.std(daily_returns, ddof=1) * np.sqrt(252)
 print(f"Annualized Volatility: {annualized_volatility:.2%}")
 
 # Get current stock price from the latest available data
-current_price = hist['Close'][-1]
+current_price = hist['Close'].iloc[-1]
 print(f"Current Stock Price: ${current_price:.2f}")
 
 # Fetch options data
@@ -1,12 +1,21 @@
-from scipy.stats import norm
-import numpy as np
+import math
+
+_SQRT2 = math.sqrt(2)
+
+def _Phi(x):
+    return 0.5 * (1.0 + math.erf(x / _SQRT2))
 
 # Define the Black-Scholes function for call and put
 def black_scholes(S, K, T, r, sigma):
-    d1 = (np.log(S / K) + (r + 0.5 * sigma**2) * T) / (sigma * np.sqrt(T))
-    d2 = d1 - sigma * np.sqrt(T)
-    call_price = S * norm.cdf(d1) - K * np.exp(-r * T) * norm.cdf(d2)
-    put_price = K * np.exp(-r * T) * norm.cdf(-d2) - S * norm.cdf(-d1)
+    if T <= 0 or sigma == 0 or S <= 0 or K <= 0:
+        return 0.0, 0.0  # Expired option or degenerate inputs
+    sigma_sqrtT = sigma * math.sqrt(T)
+    disc = math.exp(-r * T)
+    logSK = math.log(S / K)
+    d1 = (logSK + (r + 0.5 * sigma * sigma) * T) / sigma_sqrtT
+    d2 = d1 - sigma_sqrtT
+    call_price = S * _Phi(d1) - K * disc * _Phi(d2)
+    put_price = K * disc * _Phi(-d2) - S * _Phi(-d1)
     return call_price, put_price
 
 # Set parameters
@@ -0,0 +1,133 @@
+import math
+import numpy as np
+from numba import njit, prange
+
+INV_SQRT_2PI = 0.3989422804014327
+IV_SIGMA_LO = 1e-6
+IV_SIGMA_HI = 5.0
+IV_SIGMA_TOL = 1e-8  # converged once |price error| / vega is below this
+IV_MAX_SIGMA_ERR = 1e-4  # reject solutions the norm_cdf error can move further than this
+NORM_CDF_MAX_ERR = 7.5e-8
+IV_MAX_ITER = 100
+
+@njit(fastmath=True, cache=True)
+def norm_cdf(x):
+    """Standard normal CDF via the Abramowitz-Stegun 26.2.17 approximation (|error| < 7.5e-8)."""
+    t = 1.0 / (1.0 + 0.2316419 * abs(x))
+    poly = t * (0.319381530 + t * (-0.356563782 + t * (1.781477937 + t * (-1.821255978 + t * 1.330274429))))
+    tail = INV_SQRT_2PI * math.exp(-0.5 * x * x) * poly
+    return 1.0 - tail if x >= 0 else tail
+
+@njit(parallel=True, fastmath=True, cache=True)
+def bs_batch(S, Ks, T, r, sigma, out_call, out_put):
+    """Fill out_call/out_put with Black-Scholes prices for every strike in Ks."""
+    sqrtT = math.sqrt(T)
+    sigma_sqrtT = sigma * sqrtT
+    disc = math.exp(-r * T)
+    drift = (r + 0.5 * sigma * sigma) * T
+    for i in prange(Ks.shape[0]):
+        K = Ks[i]
+        d1 = (math.log(S / K) + drift) / sigma_sqrtT
+        d2 = d1 - sigma_sqrtT
+        Nd1 = norm_cdf(d1)
+        Nd2 = norm_cdf(d2)
+        out_call[i] = S * Nd1 - K * disc * Nd2
+        out_put[i] = K * disc * (1.0 - Nd2) - S * (1.0 - Nd1)
+
+def black_scholes_numba(S, Ks, T, r, sigma):
+    Ks = np.ascontiguousarray(Ks, dtype=np.float64)
+    if np.isnan(S) or np.isnan(T) or np.isnan(r) or np.isnan(sigma) or sigma == 0 or T <= 0:
+        return np.zeros_like(Ks), np.zeros_like(Ks)  # same as black_scholes_vec
+    call = np.empty_like(Ks)
+    put = np.empty_like(Ks)
+    bs_batch(float(S), Ks, float(T), float(r), float(sigma), call, put)
+    return call, put
+
+@njit(parallel=True, fastmath=True, cache=True)
+def greeks_batch(S, Ks, T, r, sigma, is_call, delta, gamma, theta, vega, rho):
+    """Fill the five Greek arrays in one pass, sharing d1, d2, N(d1), N(d2) and n(d1) per strike."""
+    sqrtT = math.sqrt(T)
+    sigma_sqrtT = sigma * sqrtT
+    disc = math.exp(-r * T)
+    drift = (r + 0.5 * sigma * sigma) * T
+    for i in prange(Ks.shape[0]):
+        K = Ks[i]
+        # Zero denominators give 0, as safe_divide does in calculate_greeks
+        d1 = (math.log(S / K) + drift) / sigma_sqrtT if sigma_sqrtT != 0.0 else 0.0
+        d2 = d1 - sigma_sqrtT
+        Nd1 = norm_cdf(d1)
+        Nd2 = norm_cdf(d2)
+        nd1 = INV_SQRT_2PI * math.exp(-0.5 * d1 * d1)
+        delta[i] = Nd1 if is_call else Nd1 - 1.0
+        gamma[i] = nd1 / (S * sigma_sqrtT) if S * sigma_sqrtT != 0.0 else 0.0
+        theta[i] = -S * nd1 * sigma / (2.0 * sqrtT) - r * K * disc * Nd2
+        vega[i] = S * nd1 * sqrtT / 100.0
+        rho[i] = K * T * disc * (Nd2 if is_call else Nd2 - 1.0) / 100.0
+
+def calculate_greeks_numba(S, Ks, T, r, sigma, option_type='call'):
+    Ks = np.ascontiguousarray(Ks, dtype=np.float64)
+    if np.isnan(S) or np.isnan(sigma) or np.isnan(T) or np.isnan(r) or T <= 0:  # same guard as calculate_greeks
+        return {key: np.full(Ks.shape, np.nan) for key in ('Delta', 'Gamma', 'Theta', 'Vega', 'Rho')}
+    results = {key: np.empty_like(Ks) for key in ('Delta', 'Gamma', 'Theta', 'Vega', 'Rho')}
+    greeks_batch(float(S), Ks, float(T), float(r), float(sigma), option_type == 'call',
+                 results['Delta'], results['Gamma'], results['Theta'], results['Vega'], results['Rho'])
+    return results
+
+@njit(cache=True)
+def _iv_scalar(price, S, K, T, r, is_call):
+    """Bracketed Newton implied volatility for one option.
+
+    NaN outside the no-arbitrage bounds, when the iteration does not converge,
+    or when vega is too small for norm_cdf's accuracy to pin sigma down.
+    """
+    sqrtT = math.sqrt(T)
+    disc = math.exp(-r * T)
+    if is_call:
+        intrinsic, upper = max(S - K * disc, 0.0), S
+    else:
+        intrinsic, upper = max(K * disc - S, 0.0), K * disc
+    if not (intrinsic < price < upper):
+        return np.nan
+    lo = IV_SIGMA_LO
+    hi = IV_SIGMA_HI
+    sigma = min(max(math.sqrt(2.0 * math.pi / T) * price / S, lo), hi)
+    logSK = math.log(S / K)
+    for _ in range(IV_MAX_ITER):
+        sigma_sqrtT = sigma * sqrtT
+        d1 = (logSK + (r + 0.5 * sigma * sigma) * T) / sigma_sqrtT
+        d2 = d1 - sigma_sqrtT
+        if is_call:
+            model = S * norm_cdf(d1) - K * disc * norm_cdf(d2)
+        else:
+            model = K * disc * norm_cdf(-d2) - S * norm_cdf(-d1)
+        diff = model - price
+        vega = S * INV_SQRT_2PI * math.exp(-0.5 * d1 * d1) * sqrtT
+        if abs(diff) <= IV_SIGMA_TOL * vega:
+            if NORM_CDF_MAX_ERR * (S + K * disc) > IV_MAX_SIGMA_ERR * vega:
+                return np.nan
+            return sigma
+        if diff > 0:
+            hi = sigma
+        else:
+            lo = sigma
+        step = sigma - diff / vega if vega > 0.0 else hi
+        if not (lo < step < hi):
+            step = 0.5 * (lo + hi)
+        sigma = step
+    return np.nan
+
+@njit(parallel=True, cache=True)
+def iv_batch(prices, S, Ks, T, r, is_call, out):
+    """Fill out with the implied volatility of every (price, strike) pair, one strike per prange iteration."""
+    for i in prange(Ks.shape[0]):
+        out[i] = _iv_scalar(prices[i], S, Ks[i], T, r, is_call[i])
+
+def implied_vol_numba(S, Ks, T, r, prices, is_call):
+    Ks = np.ascontiguousarray(Ks, dtype=np.float64)
+    prices = np.ascontiguousarray(np.broadcast_to(np.asarray(prices, dtype=np.float64), Ks.shape))
+    is_call = np.ascontiguousarray(np.broadcast_to(np.asarray(is_call, dtype=np.bool_), Ks.shape))
+    if T <= 0:
+        return np.full(Ks.shape, np.nan)
+    out = np.empty_like(Ks)
+    iv_batch(prices, float(S), Ks, float(T), float(r), is_call, out)
+    return out
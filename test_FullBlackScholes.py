@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+from FullBlackScholes import black_scholes_vec, implied_vol_slice
+
+S, T, r = 100.0, 0.5, 0.03
+Ks = np.linspace(40.0, 200.0, 321)
+
+@pytest.mark.parametrize('true_vol', [0.05, 0.1, 0.3, 0.8, 2.0])
+def test_implied_vol_slice_round_trip(true_vol):
+    call, put = black_scholes_vec(S, Ks, T, r, true_vol)
+    is_call = Ks >= S  # out-of-the-money side of the chain
+    iv = implied_vol_slice(S, Ks, T, r, np.where(is_call, call, put), is_call)
+    # Strikes whose price underflows cannot be solved and must come back NaN, never a wrong value
+    solved = ~np.isnan(iv)
+    np.testing.assert_allclose(iv[solved], true_vol, atol=1e-7)
+    assert solved[np.abs(Ks - S) <= 20.0].all()
+
+def test_implied_vol_slice_low_vol_far_otm_is_not_the_initial_guess():
+    strikes = np.arange(130.0, 146.0)
+    call, _ = black_scholes_vec(S, strikes, T, r, 0.05)
+    iv = implied_vol_slice(S, strikes, T, r, call, True)
+    solved = ~np.isnan(iv)
+    assert solved.any()
+    np.testing.assert_allclose(iv[solved], 0.05, atol=1e-7)
+
+def test_implied_vol_slice_rejects_arbitrage_prices():
+    iv = implied_vol_slice(S, [90.0, 110.0], T, r, [0.0, 200.0], True)
+    assert np.isnan(iv).all()
+
+def test_implied_vol_slice_nan_when_not_converged():
+    call, _ = black_scholes_vec(S, Ks, T, r, 0.3)
+    iv = implied_vol_slice(S, Ks, T, r, call, True, max_iter=1)
+    assert np.isnan(iv).any()
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+from scipy.special import ndtr
+
+from bs_numba import norm_cdf, black_scholes_numba, calculate_greeks_numba, implied_vol_numba
+from FullBlackScholes import black_scholes_vec, calculate_greeks
+
+S, T, r, sigma = 100.0, 0.5, 0.03, 0.25
+Ks = np.linspace(60.0, 140.0, 81)
+
+def test_norm_cdf_matches_ndtr():
+    xs = np.linspace(-8.0, 8.0, 4001)
+    errors = [abs(norm_cdf(x) - ndtr(x)) for x in xs]
+    assert max(errors) < 7.5e-8
+
+def test_black_scholes_numba_matches_vec():
+    call, put = black_scholes_numba(S, Ks, T, r, sigma)
+    call_ref, put_ref = black_scholes_vec(S, Ks, T, r, sigma)
+    np.testing.assert_allclose(call, call_ref, atol=1e-5 * S)
+    np.testing.assert_allclose(put, put_ref, atol=1e-5 * S)
+
+@pytest.mark.parametrize('bad', [dict(sigma=0.0), dict(T=-0.1), dict(S=np.nan)])
+def test_black_scholes_numba_invalid_inputs_match_vec(bad):
+    args = dict(S=S, Ks=Ks, T=T, r=r, sigma=sigma)
+    args.update(bad)
+    for got, ref in zip(black_scholes_numba(**args), black_scholes_vec(**args)):
+        np.testing.assert_array_equal(got, ref)
+
+@pytest.mark.parametrize('option_type', ['call', 'put'])
+@pytest.mark.parametrize('vol', [sigma, 0.0])
+def test_greeks_numba_matches_calculate_greeks(option_type, vol):
+    got = calculate_greeks_numba(S, Ks, T, r, vol, option_type)
+    ref = calculate_greeks(S, Ks, T, r, vol, option_type)
+    for key in ref:
+        np.testing.assert_allclose(got[key], ref[key], atol=1e-6)
+
+@pytest.mark.parametrize('true_vol', [0.05, 0.1, 0.3, 0.8])
+def test_implied_vol_numba_is_accurate_or_nan(true_vol):
+    strikes = np.linspace(40.0, 200.0, 321)
+    call, put = black_scholes_vec(S, strikes, T, r, true_vol)
+    is_call = strikes >= S
+    iv = implied_vol_numba(S, strikes, T, r, np.where(is_call, call, put), is_call)
+    # Low-vega strikes may be NaN, but never a clipped bound or another wrong value
+    solved = ~np.isnan(iv)
+    np.testing.assert_allclose(iv[solved], true_vol, atol=1e-4)
+    assert solved[np.abs(strikes - S) <= 5.0].all()
+
+def test_implied_vol_numba_rejects_arbitrage_prices():
+    iv = implied_vol_numba(S, [90.0, 110.0], T, r, [0.0, 200.0], True)
+    assert np.isnan(iv).all()